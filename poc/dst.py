@@ -3,6 +3,8 @@ Domain separation tags for all XOF usages, collected all in one place in order
 to make it easier to check that they're all distinct.
 """
 
+import functools
+
 from vdaf_poc.common import byte, to_be_bytes
 
 # The version of this document. This should be `0` until the document
@@ -27,11 +29,15 @@ USAGE_EXTEND: int = 10
 USAGE_CONVERT: int = 11
 
 
+# Implementation note: the same tags are derived for every node of the VIDPF
+# tree and every report processed in a given context, so they are cached.
+@functools.lru_cache(maxsize=256)
 def dst(ctx: bytes, usage: int) -> bytes:
     assert usage in range(12)
     return b'mastic' + byte(VERSION) + byte(usage) + ctx
 
 
+@functools.lru_cache(maxsize=256)
 def dst_alg(ctx: bytes, usage: int, algorithm_id: int) -> bytes:
     assert usage in range(12)
     assert algorithm_id in range(2 ** 32 - 1)
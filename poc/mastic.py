@@ -1,6 +1,5 @@
 '''The Mastic VDAF'''
 
-import itertools
 from typing import Any, Optional, TypeAlias, TypeVar, cast
 
 from vdaf_poc.common import (concat, front, to_be_bytes, to_le_bytes, vec_add,
@@ -15,7 +14,7 @@ from dst import (USAGE_EVAL_PROOF, USAGE_JOINT_RAND, USAGE_JOINT_RAND_PART,
                  USAGE_JOINT_RAND_SEED, USAGE_ONEHOT_CHECK,
                  USAGE_PAYLOAD_CHECK, USAGE_PROOF_SHARE, USAGE_PROVE_RAND,
                  USAGE_QUERY_RAND, dst_alg)
-from vidpf import PROOF_SIZE, CorrectionWord, Vidpf
+from vidpf import PROOF_SIZE, CorrectionWord, PrefixTreeIndex, Vidpf
 
 W = TypeVar("W")
 R = TypeVar("R")
@@ -213,8 +212,7 @@ class Mastic(
             input_share: MasticInputShare,
     ) -> tuple[MasticPrepState, MasticPrepShare]:
         (level, prefixes, do_weight_check) = agg_param
-        (key, proof_share, seed, peer_joint_rand_part) = \
-            self.expand_input_share(ctx, agg_id, input_share)
+        (key, _proof_share, seed, peer_joint_rand_part) = input_share
 
         # Evaluate the VIDPF.
         (out_share, root) = self.vidpf.eval_with_siblings(
@@ -232,8 +230,9 @@ class Mastic(
         joint_rand_seed = None
         verifier_share = None
         if do_weight_check:
-            beta_share = self.vidpf.get_beta_share(agg_id, correction_words,
-                                                   key, ctx, nonce)
+            # The first level of the prefix tree was already evaluated
+            # above, so we can compute our share of `beta` from it.
+            beta_share = self.vidpf.get_beta_share_from_root(agg_id, root)
             query_rand = self.query_rand(verify_key, ctx, nonce, level)
             joint_rand = []
             if self.flp.JOINT_RAND_LEN > 0:
@@ -247,6 +246,7 @@ class Mastic(
                     joint_rand_parts = [peer_joint_rand_part, joint_rand_part]
                 joint_rand_seed = self.joint_rand_seed(ctx, joint_rand_parts)
                 joint_rand = self.joint_rand(ctx, joint_rand_seed)
+            proof_share = self.expand_proof_share(ctx, agg_id, input_share)
             verifier_share = self.flp.query(
                 beta_share[1:],
                 proof_share,
@@ -420,13 +420,8 @@ class Mastic(
         encoded += to_be_bytes(level, 2)
         encoded += to_be_bytes(len(prefixes), 4)
         prefixes_len = ((level + 1) + 7) // 8 * len(prefixes)
-        encoded_prefixes = bytearray()
-        for prefix in prefixes:
-            for chunk in itertools.batched(prefix, 8):
-                byte_out = 0
-                for (bit_position, bit) in enumerate(chunk):
-                    byte_out |= bit << (7 - bit_position)
-                encoded_prefixes.append(byte_out)
+        encoded_prefixes = b''.join(
+            PrefixTreeIndex(prefix).encode() for prefix in prefixes)
         assert len(encoded_prefixes) == prefixes_len
         encoded += encoded_prefixes
         # NOTE: The do_weight_check is the only difference between
@@ -434,20 +429,18 @@ class Mastic(
         encoded += to_be_bytes(int(do_weight_check), 1)
         return encoded
 
-    def expand_input_share(
+    def expand_proof_share(
             self,
             ctx: bytes,
             agg_id: int,
             input_share: MasticInputShare,
-    ) -> tuple[bytes, list[F], Optional[bytes], Optional[bytes]]:
+    ) -> list[F]:
+        (_key, proof_share, seed, _peer_joint_rand_part) = input_share
         if agg_id == 0:
-            (key, proof_share, seed, peer_joint_rand_part) = input_share
             assert proof_share is not None
-        else:
-            (key, _leader_proof_share, seed, peer_joint_rand_part) = input_share
-            assert seed is not None
-            proof_share = self.helper_proof_share(ctx, seed)
-        return (key, proof_share, seed, peer_joint_rand_part)
+            return proof_share
+        assert seed is not None
+        return self.helper_proof_share(ctx, seed)
 
     def helper_proof_share(self, ctx, seed: bytes) -> list[F]:
         return self.xof.expand_into_vec(
@@ -2,9 +2,10 @@ import unittest
 from random import randrange
 
 from vdaf_poc.common import gen_rand, vec_add
+from vdaf_poc.common import xor as reference_xor
 from vdaf_poc.field import Field128
 
-from vidpf import PrefixTreeEntry, PrefixTreeIndex, Vidpf
+from vidpf import PrefixTreeEntry, PrefixTreeIndex, Vidpf, xor
 
 
 class Test(unittest.TestCase):
@@ -61,6 +62,51 @@ class Test(unittest.TestCase):
             # Either both aggregators correct their node proof or neither does.
             self.assertEqual(node[0].proof, node[1].proof)
 
+    def test_xor(self):
+        for length in [0, 1, 16, 33]:
+            left = gen_rand(length)
+            right = gen_rand(length)
+            self.assertEqual(xor(left, right), reference_xor(left, right))
+
+    def test_prefix_tree_index_encode(self):
+        self.assertEqual(PrefixTreeIndex(()).encode(), b'')
+        self.assertEqual(PrefixTreeIndex((True,)).encode(), b'\x80')
+        self.assertEqual(
+            PrefixTreeIndex((False, True, True, False, False, False, False,
+                             True, True)).encode(),
+            b'\x61\x80',
+        )
+
+    def test_get_beta_share_from_root(self):
+        vidpf = Vidpf(Field128, 5, 2)
+        ctx = b'some application'
+        nonce = gen_rand(vidpf.NONCE_SIZE)
+        rand = gen_rand(vidpf.RAND_SIZE)
+        beta = [Field128(1), Field128(13)]
+        (pub, keys) = vidpf.gen(vidpf.test_input_rand(), beta, ctx, nonce,
+                                rand)
+
+        level = 2
+        prefixes = vidpf.prefixes_for_level(level)
+        beta_shares = []
+        for agg_id in range(2):
+            (_out_share, root) = vidpf.eval_with_siblings(
+                agg_id,
+                pub,
+                keys[agg_id],
+                level,
+                prefixes,
+                ctx,
+                nonce,
+            )
+            beta_share = vidpf.get_beta_share_from_root(agg_id, root)
+            self.assertEqual(
+                beta_share,
+                vidpf.get_beta_share(agg_id, pub, keys[agg_id], ctx, nonce),
+            )
+            beta_shares.append(beta_share)
+        self.assertEqual(vec_add(beta_shares[0], beta_shares[1]), beta)
+
     def test(self):
         vidpf = Vidpf(Field128, 2, 2)
         self.assertEqual(vidpf.BITS, 2)
@@ -1,10 +1,11 @@
 """Verifiable Distributed Point Function (VIDPF)"""
 
 import itertools
+from collections import deque
 from random import randrange
 from typing import Generic, Self, TypeAlias, TypeVar
 
-from vdaf_poc.common import to_le_bytes, vec_add, vec_neg, vec_sub, xor
+from vdaf_poc.common import to_le_bytes, vec_add, vec_neg, vec_sub
 from vdaf_poc.field import NttField
 from vdaf_poc.idpf_bbcggi21 import pack_bits
 from vdaf_poc.xof import XofFixedKeyAes128, XofTurboShake128
@@ -25,6 +26,18 @@ CorrectionWord: TypeAlias = tuple[
 ]
 
 
+def xor(left: bytes, right: bytes) -> bytes:
+    """
+    Return the bitwise XOR of two byte strings of equal length.
+
+    This is equivalent to `vdaf_poc.common.xor`, but does the XOR as one
+    integer operation rather than byte by byte.
+    """
+    assert len(left) == len(right)
+    return (int.from_bytes(left, 'big') ^ int.from_bytes(right, 'big')) \
+        .to_bytes(len(left), 'big')
+
+
 class PrefixTreeIndex:
     def __init__(self, path: tuple[bool, ...]):
         self.path = path
@@ -248,11 +261,12 @@ class Vidpf(Generic[F]):
         for prefix in prefixes:
             n = root
             for (i, bit) in enumerate(prefix):
-                idx = PrefixTreeIndex(prefix[:i+1])
-                if n.left_child is None:
+                # The children of a node are always expanded together, so
+                # only nodes we haven't visited yet need to be expanded.
+                if n.left_child is None or n.right_child is None:
+                    idx = PrefixTreeIndex(prefix[:i+1])
                     n.left_child = self.eval_next(n, correction_words[i], ctx,
                                                   nonce, idx.left_sibling())
-                if n.right_child is None:
                     n.right_child = self.eval_next(n, correction_words[i], ctx,
                                                    nonce, idx.right_sibling())
                 n = n.right_child if bit else n.left_child
@@ -269,11 +283,25 @@ class Vidpf(Generic[F]):
             nonce: bytes,
     ) -> list[F]:
         root = PrefixTreeEntry.root(key, bool(agg_id))
-        left = self.eval_next(root, correction_words[0], ctx, nonce,
-                              PrefixTreeIndex((False,)))
-        right = self.eval_next(root, correction_words[0], ctx, nonce,
-                               PrefixTreeIndex((True,)))
-        beta_share = vec_add(left.w, right.w)
+        root.left_child = self.eval_next(root, correction_words[0], ctx,
+                                         nonce, PrefixTreeIndex((False,)))
+        root.right_child = self.eval_next(root, correction_words[0], ctx,
+                                          nonce, PrefixTreeIndex((True,)))
+        return self.get_beta_share_from_root(agg_id, root)
+
+    def get_beta_share_from_root(
+            self,
+            agg_id: int,
+            root: PrefixTreeEntry,
+    ) -> list[F]:
+        """
+        Compute the share of `beta` from the children of the root of the
+        prefix tree. This allows an aggregator that has already evaluated the
+        tree with `eval_with_siblings()` to reuse the first level.
+        """
+        assert root.left_child is not None
+        assert root.right_child is not None
+        beta_share = vec_add(root.left_child.w, root.right_child.w)
         if agg_id == 1:
             beta_share = vec_neg(beta_share)
         return beta_share
@@ -383,15 +411,13 @@ class Vidpf(Generic[F]):
             self,
             public_share: list[CorrectionWord]) -> bytes:
         (seeds, ctrl, payloads, proofs) = zip(*public_share)
-        encoded = bytes()
-        encoded += pack_bits(list(itertools.chain.from_iterable(ctrl)))
-        for seed in seeds:
-            encoded += seed
-        for payload in payloads:
-            encoded += self.field.encode_vec(payload)
-        for proof in proofs:
-            encoded += proof
-        return encoded
+        return b''.join([
+            pack_bits(list(itertools.chain.from_iterable(ctrl))),
+            b''.join(seeds),
+            self.field.encode_vec(
+                list(itertools.chain.from_iterable(payloads))),
+            b''.join(proofs),
+        ])
 
     def is_prefix(self,
                   x: tuple[bool, ...],
@@ -455,13 +481,13 @@ class Vidpf(Generic[F]):
         )
 
         h = hashlib.sha3_256()
-        q: list[PrefixTreeEntry] = []
+        q: deque[PrefixTreeEntry] = deque()
         if root.left_child is not None:
             q.append(root.left_child)
         if root.right_child is not None:
             q.append(root.right_child)
         while len(q) > 0:
-            (n, q) = (q[0], q[1:])
+            n = q.popleft()
             h.update(n.proof)
             if n.left_child is not None:
                 q.append(n.left_child)